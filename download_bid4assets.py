@@ -7,12 +7,20 @@ Usage:
     export bid_username="your_username"
     export bid_password="your_password"
     python download_bid4assets.py
+
+Sale dates that already have a file in the output directory are skipped;
+set bid_force=1 to download them again. The browser runs headless; set
+bid_headful=1 to watch it.
 """
 
 import os
+import re
 import asyncio
+import weakref
 from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from playwright.async_api import async_playwright, Page, Browser
+from playwright.async_api import TimeoutError as PWTimeoutError
 
 # Configuration
 FORECLOSURES_URL = "https://www.bid4assets.com/philaforeclosures"
@@ -22,35 +30,278 @@ LOGIN_URL = "https://www.bid4assets.com/myaccount/login"
 BASE_DIR = Path(__file__).parent
 FORECLOSURES_DIR = BASE_DIR / "foreclosures"
 TAXSALES_DIR = BASE_DIR / "taxsales"
+# Saved cookies/localStorage from the last successful login
+AUTH_STATE_FILE = BASE_DIR / "auth.json"
+# Pages downloading sale dates in parallel for each auction site
+DOWNLOAD_WORKERS = 4
+# Extensions the site has served property lists as
+DOWNLOAD_EXTENSIONS = ('.xlsx', '.xls', '.csv')
+# Requests we never need: we only read the <select>s and click download buttons
+BLOCKED_RESOURCE_TYPES = {'image', 'font', 'media'}
+BLOCKED_URL_PARTS = ('google-analytics', 'googletagmanager', 'doubleclick')
+# Anything but letters, digits, space, dash and underscore gets replaced in file names
+UNSAFE_FILENAME_CHARS = re.compile(r'[^A-Za-z0-9 _-]')
+# Navigations only wait for the DOM; callers then wait for the element they need
+NAVIGATION_TIMEOUT = 8000
+# Set by the (OneTrust) cookie banner once it has been accepted or closed
+CONSENT_COOKIE = 'OptanonAlertBoxClosed'
+
+# Contexts whose cookie banner has already been dealt with (the consent cookie
+# lives in the context, so the banner does not come back on later pages)
+consent_handled = weakref.WeakSet()
+
+# Listing URL -> (download URL parts, query params, sale date param, extension),
+# learned from the first browser download so later dates can be fetched over HTTP
+direct_downloads = {}
+
+
+# In-page scripts, defined once and reused on every call
+
+# Fill the username/password fields and click submit in one round-trip
+FILL_LOGIN_JS = '''({username, password}) => {
+    const fill = (input, value) => {
+        input.focus();
+        input.value = value;
+        input.dispatchEvent(new Event('input', { bubbles: true }));
+        input.dispatchEvent(new Event('change', { bubbles: true }));
+    };
+    const result = { username: false, password: false, clicked: false };
+
+    // Find username/email input
+    const inputs = document.querySelectorAll('input');
+    let userInput = null;
+    for (const input of inputs) {
+        const type = input.type.toLowerCase();
+        const name = (input.name || '').toLowerCase();
+        const id = (input.id || '').toLowerCase();
+        const placeholder = (input.placeholder || '').toLowerCase();
+
+        if (type === 'email' || name.includes('email') || name.includes('username') ||
+            id.includes('email') || id.includes('username') ||
+            placeholder.includes('email') || placeholder.includes('username')) {
+            userInput = input;
+            break;
+        }
+    }
+    // Fallback: first text/email input
+    if (!userInput) {
+        userInput = Array.from(inputs).find(i => i.type === 'text' || i.type === 'email');
+    }
+    if (userInput) {
+        fill(userInput, username);
+        result.username = true;
+    }
+
+    const passwordInput = document.querySelector('input[type="password"]');
+    if (passwordInput) {
+        fill(passwordInput, password);
+        result.password = true;
+    }
+
+    // Look for submit button
+    const buttons = document.querySelectorAll('button, input[type="submit"]');
+    for (const btn of buttons) {
+        const text = btn.textContent.toLowerCase();
+        const type = btn.type;
+        if (type === 'submit' || text.includes('log in') || text.includes('login') || text.includes('sign in')) {
+            btn.click();
+            result.clicked = true;
+            return result;
+        }
+    }
+    // Fallback: any button in a form
+    const form = document.querySelector('form');
+    if (form) {
+        const btn = form.querySelector('button');
+        if (btn) {
+            btn.click();
+            result.clicked = true;
+        }
+    }
+    return result;
+}'''
+
+# Index (among all <select>s) of the sale date dropdown, or -1
+FIND_DROPDOWN_JS = '''() => {
+    const dropdownSelectors = [
+        'select[name*="sale"]',
+        'select[name*="date"]',
+        'select#saleDate',
+        'select.sale-date',
+        'select[id*="sale"]',
+        'select[id*="date"]',
+        'select'  // Fallback to any select
+    ];
+    const selects = Array.from(document.querySelectorAll('select'));
+    for (const selector of dropdownSelectors) {
+        for (const el of document.querySelectorAll(selector)) {
+            // Check if this dropdown has sale date options
+            if (el.options.length > 1) {
+                return selects.indexOf(el);
+            }
+        }
+    }
+    return -1;
+}'''
+
+# [value, text] for every option of a <select>
+LIST_OPTIONS_JS = "select => Array.from(select.options).map(o => [o.value, o.textContent.trim()])"
+
+# DOM click, which doesn't care whether the element is scrolled into view
+CLICK_JS = "el => el.click()"
+
+# Select the first option with a value and fire change events; returns that value
+SELECT_FIRST_OPTION_JS = '''(select) => {
+    const option = Array.from(select.options).find(o => o.value.trim());
+    if (!option) return null;
+    select.value = option.value;
+    select.dispatchEvent(new Event('input', { bubbles: true }));
+    select.dispatchEvent(new Event('change', { bubbles: true }));
+    return option.value;
+}'''
+
+# Hide the usual automation fingerprints from the site
+STEALTH_INIT_JS = '''
+Object.defineProperty(navigator, 'webdriver', {
+    get: () => undefined
+});
+Object.defineProperty(navigator, 'plugins', {
+    get: () => [1, 2, 3, 4, 5]
+});
+Object.defineProperty(navigator, 'languages', {
+    get: () => ['en-US', 'en']
+});
+window.chrome = { runtime: {} };
+'''
+
+
+def sanitize_filename(text: str) -> str:
+    """Turn a sale date label into a safe file name (without extension)."""
+    return UNSAFE_FILENAME_CHARS.sub('_', text)
+
+
+def existing_download(output_dir: Path, filename_prefix: str):
+    """Return the already-downloaded file for this prefix, if any."""
+    for ext in DOWNLOAD_EXTENSIONS:
+        filepath = output_dir / f"{filename_prefix}{ext}"
+        if filepath.exists():
+            return filepath
+    return None
+
+
+def remember_download_url(listing_url: str, download_url: str, date_value: str, ext: str):
+    """Learn how to fetch a listing's property lists directly from one browser download."""
+    if not listing_url or not date_value or listing_url in direct_downloads:
+        return
+    parts = urlsplit(download_url)
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    date_param = next((key for key, value in params if value == date_value), None)
+    if date_param is None:
+        # The date isn't in the query string (e.g. a form POST), so keep using the browser
+        return
+    print(f"Property lists can be fetched directly via {parts.path}?{date_param}=...")
+    direct_downloads[listing_url] = (parts, params, date_param, ext)
+
+
+async def download_direct(context, listing_url: str, date_value: str, output_dir: Path,
+                          filename_prefix: str, downloaded_files: list) -> bool:
+    """Fetch a property list with the context's cookies, skipping the download page entirely."""
+    known = direct_downloads.get(listing_url)
+    if not known:
+        return False
+    parts, params, date_param, ext = known
+    query = urlencode([(key, date_value if key == date_param else value) for key, value in params])
+    download_url = urlunsplit(parts._replace(query=query))
+
+    try:
+        response = await context.request.get(download_url)
+    except Exception as e:
+        print(f"Direct download failed: {e}")
+        return False
+    if not response.ok or 'text/html' in response.headers.get('content-type', ''):
+        # Session expired or the endpoint wants more than the date; use the browser instead
+        print(f"Direct download returned {response.status}, falling back to the browser")
+        return False
 
+    filepath = output_dir / f"{filename_prefix}{ext}"
+    filepath.write_bytes(await response.body())
+    print(f"Downloaded: {filepath}")
+    downloaded_files.append(str(filepath))
+    return True
 
-async def logout(page: Page):
-    """Log out of the site."""
-    print("Logging out...")
-    # Try to find and click logout link
-    await page.goto("https://www.bid4assets.com/myaccount/logout", timeout=15000)
-    await asyncio.sleep(2)
-    print("Logged out")
+
+async def block_heavy_resources(route):
+    """Route handler that drops images, fonts, media and analytics requests."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(part in request.url for part in BLOCKED_URL_PARTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def navigate(page: Page, url: str):
+    """Go to url without waiting on straggling third-party resources."""
+    try:
+        await page.goto(url, wait_until='domcontentloaded')
+    except PWTimeoutError:
+        print(f"Navigation to {url} timed out, continuing anyway")
+
+
+async def wait_for_dropdown(page: Page, timeout: int = 15000) -> bool:
+    """Wait until a <select> is attached to the page. Returns False on timeout."""
+    try:
+        await page.wait_for_selector('select', state='attached', timeout=timeout)
+        return True
+    except PWTimeoutError:
+        return False
+
+
+async def wait_for_network_idle(page: Page, timeout: int = 5000):
+    """Wait for the page to settle after an in-page update, without failing on chatty trackers."""
+    try:
+        await page.wait_for_load_state('networkidle', timeout=timeout)
+    except PWTimeoutError:
+        pass
 
 
 async def handle_cookie_consent(page: Page):
-    """Handle cookie consent popup by searching DOM for Accept All Cookies button."""
-    for _ in range(10):  # Try for up to 5 seconds
-        clicked = await page.evaluate('''() => {
-            const elements = document.querySelectorAll('button, a, div, span');
-            for (const el of elements) {
-                if (el.textContent.trim() === 'Accept All Cookies') {
-                    el.click();
-                    return true;
-                }
-            }
-            return false;
-        }''')
-        if clicked:
-            print("Clicked Accept All Cookies")
-            await asyncio.sleep(1)
-            return True
-        await asyncio.sleep(0.5)
+    """Handle cookie consent popup by clicking its Accept All Cookies button."""
+    if page.context in consent_handled:
+        return True
+    # Sessions restored from auth.json already carry the consent, so the banner never shows
+    if any(cookie['name'] == CONSENT_COOKIE for cookie in await page.context.cookies()):
+        consent_handled.add(page.context)
+        return True
+    clicked = await click_cookie_consent(page)
+    if clicked:
+        # Accepted once, the consent cookie covers every later page in this context
+        consent_handled.add(page.context)
+    return clicked
+
+
+async def click_cookie_consent(page: Page):
+    """Click Accept All Cookies in the page or one of its iframes."""
+    try:
+        # Auto-waits up to 5 seconds for the banner to show up
+        await page.get_by_text('Accept All Cookies', exact=True).first.click(timeout=5000)
+        print("Clicked Accept All Cookies")
+        return True
+    except PWTimeoutError:
+        pass
+
+    # Consent banners sometimes live in an iframe; by now those have loaded, so don't wait again
+    for frame in page.frames:
+        if frame is page.main_frame:
+            continue
+        button = frame.get_by_text('Accept All Cookies', exact=True).first
+        try:
+            if await button.count():
+                await button.click(timeout=1000)
+                print("Clicked Accept All Cookies (iframe)")
+                return True
+        except Exception:
+            # Frame detached or button went away underneath us
+            continue
     return False
 
 
@@ -58,97 +309,34 @@ async def login(page: Page, username: str, password: str) -> bool:
     """Handle login if redirected to login page."""
     print("Login required, attempting to log in...")
 
-    await asyncio.sleep(2)  # Wait for form to load
+    # Wait for form to load
+    try:
+        await page.wait_for_selector('input[type="password"]', state='visible', timeout=15000)
+    except PWTimeoutError:
+        print("Password field did not appear, trying anyway...")
 
     # Handle cookie consent on login page first
     await handle_cookie_consent(page)
 
-    # Use JavaScript to find and fill the form fields
+    # Fill both fields and submit in a single round-trip to the page
     print(f"Filling username: {username}")
-    filled_username = await page.evaluate('''(username) => {
-        // Find username/email input
-        const inputs = document.querySelectorAll('input');
-        for (const input of inputs) {
-            const type = input.type.toLowerCase();
-            const name = (input.name || '').toLowerCase();
-            const id = (input.id || '').toLowerCase();
-            const placeholder = (input.placeholder || '').toLowerCase();
-
-            if (type === 'email' || name.includes('email') || name.includes('username') ||
-                id.includes('email') || id.includes('username') ||
-                placeholder.includes('email') || placeholder.includes('username')) {
-                input.focus();
-                input.value = username;
-                input.dispatchEvent(new Event('input', { bubbles: true }));
-                input.dispatchEvent(new Event('change', { bubbles: true }));
-                return true;
-            }
-        }
-        // Fallback: first text/email input
-        for (const input of inputs) {
-            if (input.type === 'text' || input.type === 'email') {
-                input.focus();
-                input.value = username;
-                input.dispatchEvent(new Event('input', { bubbles: true }));
-                input.dispatchEvent(new Event('change', { bubbles: true }));
-                return true;
-            }
-        }
-        return false;
-    }''', username)
-    print(f"Username filled: {filled_username}")
-
-    await asyncio.sleep(0.5)
-
-    print("Filling password...")
-    filled_password = await page.evaluate('''(password) => {
-        const inputs = document.querySelectorAll('input[type="password"]');
-        if (inputs.length > 0) {
-            inputs[0].focus();
-            inputs[0].value = password;
-            inputs[0].dispatchEvent(new Event('input', { bubbles: true }));
-            inputs[0].dispatchEvent(new Event('change', { bubbles: true }));
-            return true;
-        }
-        return false;
-    }''', password)
-    print(f"Password filled: {filled_password}")
-
-    await asyncio.sleep(0.5)
-
-    # Click submit button
-    print("Clicking login button...")
-    clicked = await page.evaluate('''() => {
-        // Look for submit button
-        const buttons = document.querySelectorAll('button, input[type="submit"]');
-        for (const btn of buttons) {
-            const text = btn.textContent.toLowerCase();
-            const type = btn.type;
-            if (type === 'submit' || text.includes('log in') || text.includes('login') || text.includes('sign in')) {
-                btn.click();
-                return true;
-            }
-        }
-        // Fallback: any button in a form
-        const form = document.querySelector('form');
-        if (form) {
-            const btn = form.querySelector('button');
-            if (btn) {
-                btn.click();
-                return true;
-            }
-        }
-        return false;
-    }''')
-    print(f"Login button clicked: {clicked}")
+    result = await page.evaluate(FILL_LOGIN_JS, {"username": username, "password": password})
+    print(f"Username filled: {result['username']}")
+    print(f"Password filled: {result['password']}")
+    print(f"Login button clicked: {result['clicked']}")
 
     # Wait for navigation after login
-    await asyncio.sleep(5)
+    try:
+        await page.wait_for_url(lambda u: 'login' not in u.lower(), wait_until='domcontentloaded', timeout=15000)
+    except PWTimeoutError:
+        pass
 
     # Check if login was successful (not still on login page)
     current_url = page.url
     if 'login' not in current_url.lower():
         print("Login successful!")
+        # Persist the session so later contexts and runs skip the login form
+        await page.context.storage_state(path=str(AUTH_STATE_FILE))
         return True
     else:
         print("Login may have failed, still on login page")
@@ -163,8 +351,12 @@ async def download_property_lists(page: Page, url: str, output_dir: Path, userna
     output_dir.mkdir(parents=True, exist_ok=True)
 
     print(f"\nNavigating to {url}")
-    await page.goto(url, timeout=15000)
-    await asyncio.sleep(3)  # Give page time to render and redirect
+    await navigate(page, url)
+    # Either the listing renders its dropdown or we get bounced to the login form
+    try:
+        await page.wait_for_selector('select, input[type="password"]', state='attached', timeout=15000)
+    except PWTimeoutError:
+        pass
 
     print(f"Current URL after navigation: {page.url}")
 
@@ -180,95 +372,97 @@ async def download_property_lists(page: Page, url: str, output_dir: Path, userna
             print("Failed to login, cannot continue")
             return downloaded_files
         # Navigate back to the target page
-        await page.goto(url, timeout=15000)
-        await asyncio.sleep(2)
+        await navigate(page, url)
+        await wait_for_dropdown(page)
         # Handle cookie consent again after login
         await handle_cookie_consent(page)
 
-    # Give time for JavaScript to load
-    await asyncio.sleep(2)
-
-    # Find the sales date dropdown
-    dropdown_selectors = [
-        'select[name*="sale"]',
-        'select[name*="date"]',
-        'select#saleDate',
-        'select.sale-date',
-        'select[id*="sale"]',
-        'select[id*="date"]',
-        'select'  # Fallback to any select
-    ]
-
-    dropdown = None
-    for selector in dropdown_selectors:
-        try:
-            elements = await page.query_selector_all(selector)
-            for elem in elements:
-                # Check if this dropdown has sale date options
-                options = await elem.query_selector_all('option')
-                if len(options) > 1:
-                    dropdown = elem
-                    break
-            if dropdown:
-                break
-        except:
-            continue
+    # Find the sales date dropdown: the first preferred <select> with real options,
+    # located in one pass and addressed by its position among the page's selects
+    dropdown_index = await page.evaluate(FIND_DROPDOWN_JS)
 
-    if not dropdown:
+    if dropdown_index < 0:
         print("Could not find sales date dropdown")
         # Try to find and click any download button on the page
         await try_download_current_page(page, output_dir, "default", downloaded_files)
         return downloaded_files
 
-    # Get all options from the dropdown
-    options = await dropdown.query_selector_all('option')
-    sale_dates = []
+    # Same element on every load of this listing, so the workers can reuse it
+    dropdown_selector = f"select >> nth={dropdown_index}"
 
-    for option in options:
-        value = await option.get_attribute('value')
-        text = await option.inner_text()
-        if value and value.strip() and text.strip():
-            sale_dates.append((value, text.strip()))
+    # Get all options from the dropdown in one call
+    options = await page.locator(dropdown_selector).evaluate(LIST_OPTIONS_JS)
+    sale_dates = [(value, text) for value, text in options if value and value.strip() and text]
 
     print(f"Found {len(sale_dates)} sale dates: {[s[1] for s in sale_dates]}")
 
-    # Iterate through each sale date and download
+    # Skip dates we already have from an earlier (possibly partial) run
+    pending = []
+    force = os.environ.get('bid_force') == '1'
     for value, text in sale_dates:
-        print(f"\nProcessing sale date: {text}")
-
-        # Re-find the dropdown each time (it may have become stale after navigation)
-        dropdown = await page.query_selector('select')
-        if not dropdown:
-            print("Could not find dropdown, refreshing page...")
-            await page.goto(url, timeout=15000)
-            await asyncio.sleep(3)
-            await handle_cookie_consent(page)
-            dropdown = await page.query_selector('select')
-            if not dropdown:
-                print("Still no dropdown, skipping...")
-                continue
-
-        # Select the date
+        existing = None if force else existing_download(output_dir, sanitize_filename(text))
+        if existing:
+            print(f"Already downloaded {text}: {existing}")
+        else:
+            pending.append((value, text))
+
+    # Fan the sale dates out over a few pages; the first worker reuses this page,
+    # the rest get their own contexts seeded from the saved session.
+
+    async def worker(worker_page: Page):
+        while pending:
+            value, text = pending.pop(0)
+            await download_sale_date(worker_page, url, dropdown_selector, output_dir, value, text,
+                                     downloaded_files, username, password)
+
+    async def context_worker():
+        context = await new_context(page.context.browser, saved_storage_state())
         try:
-            await dropdown.select_option(value=value)
-        except Exception as e:
-            print(f"Error selecting {text}: {e}")
-            try:
-                await dropdown.select_option(label=text)
-            except:
-                print(f"Could not select {text}")
-                continue
+            await worker(await context.new_page())
+        finally:
+            await context.close()
 
-        # Wait for page to update
-        await asyncio.sleep(2)
+    extra_workers = min(DOWNLOAD_WORKERS, len(pending)) - 1
+    await asyncio.gather(worker(page), *(context_worker() for _ in range(extra_workers)))
 
-        # Sanitize filename
-        safe_filename = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in text)
+    return downloaded_files
 
-        # Try to download (pass the date value for the second dropdown)
-        await try_download_current_page(page, output_dir, safe_filename, downloaded_files, url, username, password, value)
 
-    return downloaded_files
+async def download_sale_date(page: Page, url: str, dropdown_selector: str, output_dir: Path, value: str,
+                             text: str, downloaded_files: list, username: str, password: str):
+    """Select one sale date on the listing page and download its property list."""
+    print(f"\nProcessing sale date: {text}")
+
+    # Sanitize filename
+    safe_filename = sanitize_filename(text)
+
+    if await download_direct(page.context, url, value, output_dir, safe_filename, downloaded_files):
+        return
+
+    # The locator re-resolves after every navigation; only reload if we're not on the listing
+    dropdown = page.locator(dropdown_selector)
+    if not await dropdown.count():
+        print("Could not find dropdown, refreshing page...")
+        await navigate(page, url)
+        await wait_for_dropdown(page)
+        await handle_cookie_consent(page)
+
+    # Select the date
+    try:
+        await dropdown.select_option(value=value, timeout=15000)
+    except Exception as e:
+        print(f"Error selecting {text}: {e}")
+        try:
+            await dropdown.select_option(label=text, timeout=5000)
+        except:
+            print(f"Could not select {text}")
+            return
+
+    # Wait for page to update
+    await wait_for_network_idle(page)
+
+    # Try to download (pass the date value for the second dropdown)
+    await try_download_current_page(page, output_dir, safe_filename, downloaded_files, url, username, password, value)
 
 
 async def try_download_current_page(page: Page, output_dir: Path, filename_prefix: str, downloaded_files: list,
@@ -292,24 +486,23 @@ async def try_download_current_page(page: Page, output_dir: Path, filename_prefi
         'input[value*="Download"]'
     ]
 
-    # Find and click the first download link
-    download_btn = await page.evaluate('''() => {
-        const links = document.querySelectorAll('a');
-        for (const link of links) {
-            if (link.textContent.includes('Download Property List') || link.textContent.includes('Download')) {
-                link.click();
-                return true;
-            }
-        }
-        return false;
-    }''')
-
-    if not download_btn:
+    # Find the first download link
+    download_link = page.locator('a', has_text=re.compile('Download')).first
+    if not await download_link.count():
         print(f"Could not find download button for {filename_prefix}")
         return False
 
-    print("Clicked download link, waiting for redirect...")
-    await asyncio.sleep(3)
+    # Start listening for the redirect before clicking so we can't miss it
+    try:
+        async with page.expect_navigation(
+            url=lambda u: 'propertylistdownload' in u.lower() or 'login' in u.lower(),
+            wait_until='domcontentloaded',
+            timeout=15000
+        ):
+            await download_link.evaluate(CLICK_JS)
+            print("Clicked download link, waiting for redirect...")
+    except PWTimeoutError:
+        pass
 
     # Check if we're on the propertylistdownload page
     current_url = page.url
@@ -322,60 +515,51 @@ async def try_download_current_page(page: Page, output_dir: Path, filename_prefi
         await handle_cookie_consent(page)
 
         # Find and select the same date from the dropdown on this page
-        dropdown = await page.query_selector('select')
-        if dropdown and date_value:
+        dropdown = page.locator('select').filter(has=page.locator('option:nth-child(2)')).first
+        if date_value and await dropdown.count():
             print(f"Selecting date value: {date_value}")
             try:
-                await dropdown.select_option(value=date_value)
+                await dropdown.select_option(value=date_value, timeout=5000)
             except:
-                # Try selecting by label if value doesn't work
-                options = await dropdown.query_selector_all('option')
-                for option in options:
-                    value = await option.get_attribute('value')
-                    if value and value.strip():
-                        await dropdown.select_option(value=value)
-                        break
-            await asyncio.sleep(1)
+                # Fall back to the first real option, picked and applied inside the page
+                selected = await dropdown.evaluate(SELECT_FIRST_OPTION_JS)
+                print(f"Date value not found, selected {selected} instead")
+            await wait_for_network_idle(page)
 
         # Now click the Download button on this page (id="bttnDownload")
         try:
-            async with page.expect_download(timeout=30000) as download_info:
-                # Click the DOWNLOAD button
-                clicked = await page.evaluate('''() => {
-                    // First try the specific button ID
-                    const btn = document.getElementById('bttnDownload');
-                    if (btn) {
-                        btn.click();
-                        return true;
-                    }
-                    // Fallback to any button with DOWNLOAD text
-                    const buttons = document.querySelectorAll('button');
-                    for (const b of buttons) {
-                        if (b.textContent.trim().toUpperCase() === 'DOWNLOAD') {
-                            b.click();
-                            return true;
-                        }
-                    }
-                    return false;
-                }''')
-                if not clicked:
+            download_button = page.locator('#bttnDownload')
+            if not await download_button.count():
+                # Fallback to any button with DOWNLOAD text
+                download_button = page.get_by_role('button').filter(
+                    has_text=re.compile(r'^\s*DOWNLOAD\s*$', re.IGNORECASE)
+                ).first
+                if not await download_button.count():
                     print("Could not find Download button on download page")
                     return False
 
+            async with page.expect_download(timeout=30000) as download_info:
+                await download_button.click()
+
             download = await download_info.value
             suggested_name = download.suggested_filename
             ext = Path(suggested_name).suffix if suggested_name else '.xlsx'
             filename = f"{filename_prefix}{ext}"
             filepath = output_dir / filename
-            await download.save_as(filepath)
+            # Move Playwright's temp file into place; copy only if it's on another filesystem
+            try:
+                os.replace(await download.path(), filepath)
+            except OSError:
+                await download.save_as(filepath)
             print(f"Downloaded: {filepath}")
             downloaded_files.append(str(filepath))
+            remember_download_url(original_url, download.url, date_value, ext)
 
             # Go back to original page for next download
             if original_url:
                 print(f"Returning to {original_url}")
-                await page.goto(original_url, timeout=15000)
-                await asyncio.sleep(2)
+                await navigate(page, original_url)
+                await wait_for_dropdown(page)
             return True
 
         except Exception as e:
@@ -386,8 +570,8 @@ async def try_download_current_page(page: Page, output_dir: Path, filename_prefi
                 await handle_cookie_consent(page)
                 await login(page, username, password)
                 if original_url:
-                    await page.goto(original_url, timeout=15000)
-                    await asyncio.sleep(2)
+                    await navigate(page, original_url)
+                    await wait_for_dropdown(page)
             return False
 
     # Check if redirected to login
@@ -396,108 +580,136 @@ async def try_download_current_page(page: Page, output_dir: Path, filename_prefi
         await handle_cookie_consent(page)
         await login(page, username, password)
         if original_url:
-            await page.goto(original_url, timeout=15000)
-            await asyncio.sleep(2)
+            await navigate(page, original_url)
+            await wait_for_dropdown(page)
         return False
 
     print(f"Unexpected page: {current_url}")
     return False
 
 
-async def main():
-    # Get credentials from environment
-    username = os.environ.get('bid_username')
-    password = os.environ.get('bid_password')
+def saved_storage_state():
+    """Path to the saved session for new_context(), or None if we have not logged in yet."""
+    return str(AUTH_STATE_FILE) if AUTH_STATE_FILE.exists() else None
 
-    if not username or not password:
-        print("Error: Please set bid_username and bid_password environment variables")
-        print("  export bid_username='your_username'")
-        print("  export bid_password='your_password'")
-        return
 
-    print("Starting bid4assets downloader...")
-    print(f"Foreclosures will be saved to: {FORECLOSURES_DIR}")
-    print(f"Tax sales will be saved to: {TAXSALES_DIR}")
+async def new_context(browser: Browser, storage_state: str = None):
+    """Create a browser context with our download/stealth settings applied."""
+    context = await browser.new_context(
+        storage_state=storage_state,
+        accept_downloads=True,
+        viewport={'width': 1280, 'height': 800},
+        user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        java_script_enabled=True,
+        locale='en-US',
+        timezone_id='America/New_York',
+    )
+
+    # Remove webdriver property to avoid detection
+    await context.add_init_script(STEALTH_INIT_JS)
+    await context.route('**/*', block_heavy_resources)
+    context.set_default_navigation_timeout(NAVIGATION_TIMEOUT)
+    return context
+
 
-    async with async_playwright() as p:
+class Crawler:
+    """One Playwright instance and one browser, shared by every context we scrape with."""
+
+    def __init__(self, username: str, password: str):
+        self.username = username
+        self.password = password
+        self.playwright = None
+        self.browser = None
+
+    async def __aenter__(self):
+        self.playwright = await async_playwright().start()
         # Launch browser with stealth settings to avoid detection
-        browser = await p.chromium.launch(
-            headless=False,
+        self.browser = await self.playwright.chromium.launch(
+            headless=os.environ.get('bid_headful') != '1',
             args=[
                 '--disable-blink-features=AutomationControlled',
                 '--disable-dev-shm-usage',
                 '--no-sandbox',
             ]
         )
-        context = await browser.new_context(
-            accept_downloads=True,
-            viewport={'width': 1280, 'height': 800},
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            java_script_enabled=True,
-            locale='en-US',
-            timezone_id='America/New_York',
-        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.browser.close()
+        await self.playwright.stop()
+
+    async def context(self, storage_state: str = None):
+        """New isolated context on the shared browser."""
+        return await new_context(self.browser, storage_state)
+
+    async def login(self):
+        """Log in once and save the session, unless a saved session already exists."""
+        # Expired sessions fall back to login when download_property_lists
+        # gets redirected to the login page.
+        if saved_storage_state():
+            print(f"Reusing saved session from {AUTH_STATE_FILE}")
+            return
 
-        # Remove webdriver property to avoid detection
-        await context.add_init_script('''
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [1, 2, 3, 4, 5]
-            });
-            Object.defineProperty(navigator, 'languages', {
-                get: () => ['en-US', 'en']
-            });
-            window.chrome = { runtime: {} };
-        ''')
-
-        page = await context.new_page()
-
-        all_downloads = []
-
-        # Log in first before downloading anything
         print("\n" + "="*50)
         print("LOGGING IN FIRST")
         print("="*50)
-        await page.goto("https://www.bid4assets.com/myaccount/login", timeout=15000)
-        await asyncio.sleep(3)
-        await handle_cookie_consent(page)
-        await login(page, username, password)
+        context = await self.context()
+        try:
+            page = await context.new_page()
+            await navigate(page, LOGIN_URL)
+            await handle_cookie_consent(page)
+            await login(page, self.username, self.password)
+        finally:
+            await context.close()
 
-        # Download foreclosures
-        print("\n" + "="*50)
-        print("DOWNLOADING FORECLOSURES")
-        print("="*50)
-        foreclosure_files = await download_property_lists(
-            page, FORECLOSURES_URL, FORECLOSURES_DIR, username, password
-        )
-        all_downloads.extend(foreclosure_files)
+    async def scrape(self, url: str, output_dir: Path) -> list:
+        """Download every property list for one auction site in its own context."""
+        context = await self.context(saved_storage_state())
+        try:
+            page = await context.new_page()
+            return await download_property_lists(page, url, output_dir, self.username, self.password)
+        finally:
+            await context.close()
 
-        # Logout and login again before tax sales
-        print("\n" + "="*50)
-        print("LOGGING OUT")
-        print("="*50)
-        await logout(page)
 
-        print("\n" + "="*50)
-        print("LOGGING BACK IN")
-        print("="*50)
-        await page.goto("https://www.bid4assets.com/myaccount/login", timeout=15000)
-        await asyncio.sleep(3)
-        await handle_cookie_consent(page)
-        await login(page, username, password)
+async def main():
+    # Get credentials from environment
+    username = os.environ.get('bid_username')
+    password = os.environ.get('bid_password')
+
+    if not username or not password:
+        print("Error: Please set bid_username and bid_password environment variables")
+        print("  export bid_username='your_username'")
+        print("  export bid_password='your_password'")
+        return
+
+    print("Starting bid4assets downloader...")
+    print(f"Foreclosures will be saved to: {FORECLOSURES_DIR}")
+    print(f"Tax sales will be saved to: {TAXSALES_DIR}")
+
+    all_downloads = []
 
-        # Download tax sales
+    async with Crawler(username, password) as crawler:
+        await crawler.login()
+
+        # Download foreclosures and tax sales side by side
         print("\n" + "="*50)
-        print("DOWNLOADING TAX SALES")
+        print("DOWNLOADING FORECLOSURES AND TAX SALES")
         print("="*50)
-        taxsale_files = await download_property_lists(
-            page, TAXSALES_URL, TAXSALES_DIR, username, password
+        sites = [
+            ("foreclosures", FORECLOSURES_URL, FORECLOSURES_DIR),
+            ("tax sales", TAXSALES_URL, TAXSALES_DIR),
+        ]
+        # Let both finish before the browser closes, even if one of them fails
+        results = await asyncio.gather(
+            *(crawler.scrape(url, output_dir) for _, url, output_dir in sites),
+            return_exceptions=True,
         )
-        all_downloads.extend(taxsale_files)
-
-        await browser.close()
+        for (name, _, _), result in zip(sites, results):
+            if isinstance(result, BaseException):
+                print(f"Error downloading {name}: {result!r}")
+            else:
+                all_downloads.extend(result)
 
     # Summary
     print("\n" + "="*50)
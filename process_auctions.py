@@ -1,17 +1,25 @@
 #!/usr/bin/env python3
 import asyncio
 import aiohttp
+import os
 import time
 import re
-import sqlite3
+import aiosqlite
 import openpyxl
-from openpyxl import Workbook
+import zipfile
+from xml.sax.saxutils import escape as xml_escape
 from urllib.parse import quote_plus
 import folium
 from folium import plugins
-import json
+import orjson
 import logging
-from math import radians, cos, sin, asin, sqrt
+from collections import defaultdict
+from contextlib import nullcontext
+from operator import attrgetter
+from dataclasses import dataclass, fields
+from typing import Optional
+import numpy as np
+from math import radians, cos, sin, asin, sqrt, isfinite
 
 # Configure logging
 logging.basicConfig(
@@ -24,81 +32,207 @@ logger = logging.getLogger(__name__)
 # CONFIG
 # -------------------------------------------
 GEOCODE_CACHE_DB = "geocode_cache.db"
-CONCURRENT_WORKERS = 5
+CACHE_COMMIT_EVERY = 100  # Cache writes per commit; the rest are committed when geocoding finishes
+CACHE_BATCH_SIZE = 500  # Queries per SELECT when preloading the geocode cache (SQLite caps bound parameters)
+NEGATIVE_CACHE_TTL = 7 * 24 * 3600  # Seconds a cached "not found" is trusted before the address is retried
+CONCURRENT_WORKERS = 5  # HTTP requests in flight at once, across all lookups
 NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
 PHILA_AIS_URL = "https://api.phila.gov/ais_doc/v1/search"
+# Output link prefixes; links are built by concatenation in the per-row loops
+PHILA_LINK_PREFIX = "https://property.phila.gov/?p="
+BID4ASSETS_LINK_PREFIX = "https://www.bid4assets.com/auction/index/"
+STREETVIEW_LINK_PREFIX = "https://www.google.com/maps/place/"
 PHILA_GATEKEEPER_KEY = "6ba4de64d6ca99aa4db3b9194e37adbf"
 USER_AGENT = "AuctionProcessor/1.0 (your@email.com)"
+NOMINATIM_INTERVAL = 1.0  # Seconds between Nominatim requests across all workers (usage policy)
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=15)
+DNS_CACHE_TTL = 300  # Seconds the shared HTTP connector caches DNS lookups
+HTTP_RETRIES = 3  # Attempts per request on timeouts, connection errors and 429/503
+XLSX_ROWS_PER_WRITE = 1000  # Sheet rows serialized per write into the xlsx zip stream
+XLSX_COMPRESS_LEVEL = 1  # Deflate level for the xlsx zip; the sheet XML compresses well even at 1
+# Output workbook columns, in order: (header, AuctionRow field)
+OUTPUT_COLUMNS = (
+    ("Auction ID", "auction_id"),
+    ("Status", "status"),
+    ("Minimum Bid", "min_bid"),
+    ("Open Date", "open_date"),
+    ("Attorney", "attorney"),
+    ("Debt Amount", "debt_amount"),
+    ("Book/Writ", "book_writ"),
+    ("OPA", "opa"),
+    ("Address", "address"),
+    ("Neighborhood", "neighborhood"),
+    ("Lat", "lat"),
+    ("Lng", "lng"),
+    ("Phila Link", "phila_link"),
+    ("Bid4Assets Link", "bid4assets_link"),
+    ("Google Street View", "streetview"),
+)
+ZIP_RE = re.compile(r'\b(\d{5})\b')
+ADDRESS_PUNCT_RE = re.compile(r'[^\w\s]')
+NEIGHBORHOOD_PRECISION = 3  # Decimal places (~100m) at which properties share a neighborhood lookup
+NEIGHBORHOOD_SCALE = 10 ** NEIGHBORHOOD_PRECISION  # Neighborhood cache keys are integer multiples of this
+
+
+# -------------------------------------------
+# RESULT ROWS
+# -------------------------------------------
+@dataclass(slots=True)
+class AuctionRow:
+    """One property from the auction sheet, with its geocoded location and links."""
+    auction_id: str
+    status: Optional[str]
+    min_bid: object
+    open_date: Optional[str]
+    attorney: Optional[str]
+    debt_amount: object
+    book_writ: Optional[str]
+    opa: Optional[str]
+    address: str
+    lat: Optional[float]
+    lng: Optional[float]
+    neighborhood: str
+    phila_link: Optional[str]
+    bid4assets_link: str
+    streetview: str
 
 
 # -------------------------------------------
 # DATABASE CACHE
 # -------------------------------------------
-def init_cache():
-    conn = sqlite3.connect(GEOCODE_CACHE_DB)
-    cur = conn.cursor()
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS cache (
-            query TEXT PRIMARY KEY,
-            lat REAL,
-            lng REAL
-        )
-    """)
-    conn.commit()
+async def init_cache():
+    """Open the geocode cache and create its tables. One connection serves both tables."""
+    conn = await aiosqlite.connect(GEOCODE_CACHE_DB)
+    try:
+        # WAL + relaxed sync: cache writes no longer fsync one by one
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        await conn.execute("PRAGMA temp_store=MEMORY")
+        await conn.execute("PRAGMA cache_size=-64000")
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                query TEXT PRIMARY KEY,
+                lat REAL,
+                lng REAL
+            )
+        """)
+        async with conn.execute("PRAGMA table_info(cache)") as cur:
+            if "ts" not in [row[1] for row in await cur.fetchall()]:
+                # When the row was written, so cached misses can expire
+                await conn.execute("ALTER TABLE cache ADD COLUMN ts INTEGER")
+        async with conn.execute("PRAGMA table_info(neighborhood_cache)") as cur:
+            columns = [row[1] for row in await cur.fetchall()]
+        legacy = "lat" in columns
+        if legacy:
+            # Older caches keyed neighborhoods on REAL lat/lng; carry their rows over below
+            await conn.execute("ALTER TABLE neighborhood_cache RENAME TO neighborhood_cache_legacy")
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS neighborhood_cache (
+                lat_q INTEGER,
+                lng_q INTEGER,
+                neighborhood TEXT,
+                PRIMARY KEY (lat_q, lng_q)
+            ) WITHOUT ROWID
+        """)
+        if legacy:
+            await conn.execute(
+                "INSERT OR IGNORE INTO neighborhood_cache (lat_q, lng_q, neighborhood) "
+                "SELECT CAST(ROUND(lat * ?) AS INTEGER), CAST(ROUND(lng * ?) AS INTEGER), neighborhood "
+                "FROM neighborhood_cache_legacy",
+                (NEIGHBORHOOD_SCALE, NEIGHBORHOOD_SCALE),
+            )
+            await conn.execute("DROP TABLE neighborhood_cache_legacy")
+        await conn.commit()
+    except BaseException:
+        # aiosqlite's worker thread would otherwise keep the process alive
+        await conn.close()
+        raise
     return conn
 
 
-def cache_get(conn, query):
-    cur = conn.cursor()
-    cur.execute("SELECT lat, lng FROM cache WHERE query = ?", (query,))
-    row = cur.fetchone()
+_pending_cache_writes = 0
+
+# In-memory copies of cache rows seen this run; cache_set* are the only writers
+_geocode_mem = {}
+_neighborhood_mem = {}
+
+
+async def cache_write(conn, sql, params):
+    """Run a cache write, committing every CACHE_COMMIT_EVERY writes instead of every time."""
+    global _pending_cache_writes
+    await conn.execute(sql, params)
+    _pending_cache_writes += 1
+    if _pending_cache_writes >= CACHE_COMMIT_EVERY:
+        _pending_cache_writes = 0
+        await conn.commit()
+
+
+async def cache_get(conn, query):
+    if query in _geocode_mem:
+        return _geocode_mem[query]
+    # Misses (lat NULL) only count while younger than NEGATIVE_CACHE_TTL
+    async with conn.execute(
+        "SELECT lat, lng FROM cache WHERE query = ? AND (lat IS NOT NULL OR ts > ?)",
+        (query, int(time.time()) - NEGATIVE_CACHE_TTL),
+    ) as cur:
+        row = await cur.fetchone()
+    if row:
+        _geocode_mem[query] = row
     return row if row else None
 
 
-def cache_set(conn, query, lat, lng):
-    cur = conn.cursor()
-    cur.execute(
-        "INSERT OR REPLACE INTO cache (query, lat, lng) VALUES (?, ?, ?)",
-        (query, lat, lng),
+async def cache_get_many(conn, queries):
+    """Preload cached geocodes for many queries into the in-memory copy, one SELECT per chunk."""
+    queries = [q for q in queries if q not in _geocode_mem]
+    cutoff = int(time.time()) - NEGATIVE_CACHE_TTL
+    for start in range(0, len(queries), CACHE_BATCH_SIZE):
+        chunk = queries[start:start + CACHE_BATCH_SIZE]
+        placeholders = ",".join("?" * len(chunk))
+        async with conn.execute(
+            f"SELECT query, lat, lng FROM cache WHERE query IN ({placeholders}) AND (lat IS NOT NULL OR ts > ?)",
+            (*chunk, cutoff),
+        ) as cur:
+            for query, lat, lng in await cur.fetchall():
+                _geocode_mem[query] = (lat, lng)
+
+
+async def cache_set(conn, query, lat, lng):
+    _geocode_mem[query] = (lat, lng)
+    await cache_write(
+        conn,
+        "INSERT OR REPLACE INTO cache (query, lat, lng, ts) VALUES (?, ?, ?, ?)",
+        (query, lat, lng, int(time.time())),
     )
-    conn.commit()
-
-
-def init_neighborhood_cache():
-    """Initialize neighborhood cache table."""
-    conn = sqlite3.connect(GEOCODE_CACHE_DB)
-    cur = conn.cursor()
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS neighborhood_cache (
-            lat REAL,
-            lng REAL,
-            neighborhood TEXT,
-            PRIMARY KEY (lat, lng)
-        )
-    """)
-    conn.commit()
-    return conn
 
 
-def cache_get_neighborhood(conn, lat, lng):
+def neighborhood_key(lat, lng):
+    """Quantize coordinates to integers so nearby properties hit the same neighborhood cache entry."""
+    return (round(lat * NEIGHBORHOOD_SCALE), round(lng * NEIGHBORHOOD_SCALE))
+
+
+async def cache_get_neighborhood(conn, lat, lng):
     """Get cached neighborhood for coordinates."""
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT neighborhood FROM neighborhood_cache WHERE lat = ? AND lng = ?",
-        (lat, lng)
-    )
-    row = cur.fetchone()
+    key = neighborhood_key(lat, lng)
+    if key in _neighborhood_mem:
+        return _neighborhood_mem[key]
+    async with conn.execute(
+        "SELECT neighborhood FROM neighborhood_cache WHERE lat_q = ? AND lng_q = ?",
+        key
+    ) as cur:
+        row = await cur.fetchone()
+    if row:
+        _neighborhood_mem[key] = row[0]
     return row[0] if row else None
 
 
-def cache_set_neighborhood(conn, lat, lng, neighborhood):
+async def cache_set_neighborhood(conn, lat, lng, neighborhood):
     """Cache neighborhood for coordinates."""
-    cur = conn.cursor()
-    cur.execute(
-        "INSERT OR REPLACE INTO neighborhood_cache (lat, lng, neighborhood) VALUES (?, ?, ?)",
-        (lat, lng, neighborhood),
+    _neighborhood_mem[neighborhood_key(lat, lng)] = neighborhood
+    await cache_write(
+        conn,
+        "INSERT OR REPLACE INTO neighborhood_cache (lat_q, lng_q, neighborhood) VALUES (?, ?, ?)",
+        (*neighborhood_key(lat, lng), neighborhood),
     )
-    conn.commit()
 
 
 # -------------------------------------------
@@ -107,7 +241,10 @@ def cache_set_neighborhood(conn, lat, lng, neighborhood):
 def haversine_distance(lat1, lng1, lat2, lng2):
     """Calculate distance between two coordinates in feet."""
     # Convert decimal degrees to radians
-    lat1, lng1, lat2, lng2 = map(radians, [lat1, lng1, lat2, lng2])
+    lat1 = radians(lat1)
+    lng1 = radians(lng1)
+    lat2 = radians(lat2)
+    lng2 = radians(lng2)
 
     # Haversine formula
     dlat = lat2 - lat1
@@ -119,13 +256,60 @@ def haversine_distance(lat1, lng1, lat2, lng2):
     return c * r * 5280  # Convert to feet
 
 
-async def get_neighborhood(session, cache_conn, lat, lng, address_str=None):
+def haversine_matrix(lats, lngs, other_lats=None, other_lngs=None):
+    """Calculate distances in feet from every coordinate to every other one (or to a second set)."""
+    lats = np.radians(np.asarray(lats, dtype=float))
+    lngs = np.radians(np.asarray(lngs, dtype=float))
+    other_lats = lats if other_lats is None else np.radians(np.asarray(other_lats, dtype=float))
+    other_lngs = lngs if other_lngs is None else np.radians(np.asarray(other_lngs, dtype=float))
+
+    # Same formula as haversine_distance, broadcast to an (N, M) matrix
+    dlat = lats[:, None] - other_lats[None, :]
+    dlng = lngs[:, None] - other_lngs[None, :]
+    a = np.sin(dlat/2)**2 + np.cos(lats[:, None]) * np.cos(other_lats[None, :]) * np.sin(dlng/2)**2
+    c = 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    r = 3959  # Radius of earth in miles
+
+    return c * r * 5280  # Convert to feet
+
+
+def radius_neighbors(lats, lngs, max_distance_feet):
+    """For each coordinate, the sorted indices of all coordinates within max_distance_feet (itself included)."""
+    lats = np.asarray(lats, dtype=float)
+    lngs = np.asarray(lngs, dtype=float)
+
+    cell_lat = np.degrees(max_distance_feet / 5280 / 3959)
+    # Longitude degrees shrink towards the poles; size cells for the worst latitude, with a little slack
+    cell_lng = cell_lat * 1.01 / max(np.cos(np.radians(np.abs(lats).max())), 1e-6)
+    rows = np.floor(lats / cell_lat).astype(int).tolist()
+    cols = np.floor(lngs / cell_lng).astype(int).tolist()
+
+    cells = {}
+    for i, cell in enumerate(zip(rows, cols)):
+        cells.setdefault(cell, []).append(i)
+
+    neighbors = [None] * len(lats)
+    for (row, col), members in cells.items():
+        candidates = np.array(sorted(
+            j
+            for d_row in (-1, 0, 1)
+            for d_col in (-1, 0, 1)
+            for j in cells.get((row + d_row, col + d_col), ())
+        ))
+        distances = haversine_matrix(lats[members], lngs[members], lats[candidates], lngs[candidates])
+        for k, i in enumerate(members):
+            neighbors[i] = candidates[distances[k] <= max_distance_feet]
+
+    return neighbors
+
+
+async def get_neighborhood(session, limits, cache_conn, lat, lng, address_str=None):
     """Get neighborhood from coordinates using Nominatim reverse geocoding, fallback to zipcode."""
     if lat is None or lng is None:
         return ""
 
     # Check cache first
-    cached_neighborhood = cache_get_neighborhood(cache_conn, lat, lng)
+    cached_neighborhood = await cache_get_neighborhood(cache_conn, lat, lng)
     if cached_neighborhood:
         logger.debug(f"[CACHE HIT] Neighborhood for ({lat:.4f}, {lng:.4f}) -> {cached_neighborhood}")
         return cached_neighborhood
@@ -151,71 +335,62 @@ async def get_neighborhood(session, cache_conn, lat, lng, address_str=None):
 
         logger.debug(f"[NOMINATIM REVERSE] Requesting {url} with params: {params}")
 
-        async with session.get(url, params=params, timeout=5) as resp:
-            logger.debug(f"[NOMINATIM REVERSE] Response status: {resp.status}")
+        status, data = await fetch_json(session, limits, url, params, "NOMINATIM REVERSE", throttle=True)
+        logger.debug(f"[NOMINATIM REVERSE] Response status: {status}")
 
-            if resp.status == 200:
-                data = await resp.json()
-                logger.debug(f"[NOMINATIM REVERSE] Full response: {data}")
+        if status == 200:
+            logger.debug(f"[NOMINATIM REVERSE] Full response: {data}")
 
-                address = data.get("address", {})
-                logger.debug(f"[NOMINATIM REVERSE] Address object: {address}")
-                logger.debug(f"[NOMINATIM REVERSE] Residential field: {address.get('residential')}")
-                logger.debug(f"[NOMINATIM REVERSE] Neighbourhood field: {address.get('neighbourhood')}")
+            address = data.get("address", {})
+            logger.debug(f"[NOMINATIM REVERSE] Address object: {address}")
+            logger.debug(f"[NOMINATIM REVERSE] Residential field: {address.get('residential')}")
+            logger.debug(f"[NOMINATIM REVERSE] Neighbourhood field: {address.get('neighbourhood')}")
 
-                # Prefer residential field, fall back to neighbourhood, then zipcode
-                neighborhood = address.get("residential") or address.get("neighbourhood") or zipcode_fallback
-                logger.info(f"[NOMINATIM REVERSE] Found neighborhood: {neighborhood} for ({lat:.4f}, {lng:.4f})")
+            # Prefer residential field, fall back to neighbourhood, then zipcode
+            neighborhood = address.get("residential") or address.get("neighbourhood") or zipcode_fallback
+            logger.info(f"[NOMINATIM REVERSE] Found neighborhood: {neighborhood} for ({lat:.4f}, {lng:.4f})")
 
-                # Cache the result
-                cache_set_neighborhood(cache_conn, lat, lng, neighborhood)
-                return neighborhood
-            else:
-                logger.warning(f"[NOMINATIM REVERSE] Non-200 status: {resp.status}")
+            # Cache the result
+            await cache_set_neighborhood(cache_conn, lat, lng, neighborhood)
+            return neighborhood
+        else:
+            logger.warning(f"[NOMINATIM REVERSE] Non-200 status: {status}")
     except Exception as e:
         logger.error(f"[NOMINATIM REVERSE] Error getting neighborhood: {e}", exc_info=True)
 
     # Return zipcode if available, otherwise empty string
     if zipcode_fallback:
         logger.info(f"[ZIPCODE FALLBACK] Using zipcode: {zipcode_fallback}")
-        cache_set_neighborhood(cache_conn, lat, lng, zipcode_fallback)
+        await cache_set_neighborhood(cache_conn, lat, lng, zipcode_fallback)
         return zipcode_fallback
 
     return ""
 
 
-def cluster_properties(properties, max_distance_feet=300):
-    """Cluster properties that are within max_distance_feet of each other."""
-    if not properties:
+def cluster_properties(properties, max_distance_feet=300, coords=None):
+    """Cluster properties within max_distance_feet of each other; coords is their (lat, lng) array if precomputed."""
+    if coords is None:
+        located = [p for p in properties if p.lat is not None and p.lng is not None]
+        coords = np.array([(p.lat, p.lng) for p in located], dtype=float).reshape(-1, 2)
+    else:
+        located = properties
+    if not located:
         return []
 
+    # Which properties are close enough to each other, via the spatial grid
+    neighbors = radius_neighbors(coords[:, 0], coords[:, 1], max_distance_feet)
+
     clusters = []
-    visited = set()
+    visited = np.zeros(len(located), dtype=bool)
 
-    for i, prop in enumerate(properties):
-        if i in visited or prop.get("lat") is None or prop.get("lng") is None:
+    for i in range(len(located)):
+        if visited[i]:
             continue
 
-        cluster = [prop]
-        visited.add(i)
-
-        # Find all properties within max_distance_feet
-        for j, other_prop in enumerate(properties):
-            if j <= i or j in visited:
-                continue
-            if other_prop.get("lat") is None or other_prop.get("lng") is None:
-                continue
-
-            distance = haversine_distance(
-                prop["lat"], prop["lng"],
-                other_prop["lat"], other_prop["lng"]
-            )
-
-            if distance <= max_distance_feet:
-                cluster.append(other_prop)
-                visited.add(j)
-
-        clusters.append(cluster)
+        # Everything still unclustered within max_distance_feet of this property (including itself)
+        members = neighbors[i][~visited[neighbors[i]]]
+        visited[members] = True
+        clusters.append([located[j] for j in members])
 
     return clusters
 
@@ -223,10 +398,65 @@ def cluster_properties(properties, max_distance_feet=300):
 # -------------------------------------------
 # GEOCODING
 # -------------------------------------------
-async def geocode_address(session, cache_conn, address, opa=None):
+_nominatim_next_slot = 0.0
+
+
+class RequestLimits:
+    """Per-run request limits: slots bounds requests in flight, nominatim sends Nominatim requests one at a time."""
+
+    def __init__(self):
+        self.slots = asyncio.Semaphore(CONCURRENT_WORKERS)
+        self.nominatim = asyncio.Lock()
+
+
+async def nominatim_throttle():
+    """Wait for this request's turn in the Nominatim rate limit shared by all workers."""
+    global _nominatim_next_slot
+    now = time.monotonic()
+    slot = max(now, _nominatim_next_slot)
+    _nominatim_next_slot = slot + NOMINATIM_INTERVAL
+    if slot > now:
+        await asyncio.sleep(slot - now)
+
+
+def _retry_delay(resp, attempt):
+    """Seconds to wait before retrying: the server's Retry-After if given, else exponential backoff."""
+    retry_after = resp.headers.get("Retry-After") if resp is not None else None
+    if retry_after and retry_after.isdigit():
+        return int(retry_after)
+    return 2 ** attempt
+
+
+async def fetch_json(session, limits, url, params, label, throttle=False):
+    """GET url and return (status, data), retrying failures; data is None unless the status is 200."""
+    for attempt in range(HTTP_RETRIES):
+        resp = None
+        try:
+            # Held until the response, so no Nominatim request goes out ahead of its booked
+            # time; the rate-limit wait happens before a request slot is taken
+            async with limits.nominatim if throttle else nullcontext():
+                if throttle:
+                    await nominatim_throttle()
+                async with limits.slots, session.get(url, params=params, timeout=HTTP_TIMEOUT) as resp:
+                    if resp.status not in (429, 503):
+                        data = orjson.loads(await resp.read()) if resp.status == 200 else None
+                        return resp.status, data
+                    logger.warning(f"[{label}] Got {resp.status} (attempt {attempt + 1}/{HTTP_RETRIES})")
+        except (asyncio.TimeoutError, aiohttp.ClientError, orjson.JSONDecodeError) as e:
+            logger.warning(f"[{label}] Request failed (attempt {attempt + 1}/{HTTP_RETRIES}): {e!r}")
+        if attempt < HTTP_RETRIES - 1:
+            await asyncio.sleep(_retry_delay(resp, attempt))
+
+    logger.error(f"[{label}] Giving up on {url} after {HTTP_RETRIES} attempts")
+    return (resp.status if resp is not None else None), None
+
+
+async def geocode_address(session, limits, cache_conn, address, opa=None):
     """Returns (lat, lng) or (None, None). Tries OPA first, then full address, then zipcode."""
+    if not opa and not address:
+        return (None, None)
 
-    cached = cache_get(cache_conn, address)
+    cached = await cache_get(cache_conn, address)
     if cached:
         lat, lng = cached
         if lat is None:
@@ -235,6 +465,9 @@ async def geocode_address(session, cache_conn, address, opa=None):
             logger.debug(f"[CACHE HIT] {address} -> ({lat:.4f}, {lng:.4f})")
         return cached
 
+    # A miss is only cached when every lookup tried got a definitive answer
+    opa_answered = True
+
     # Try OPA first if available
     if opa:
         logger.debug(f"[OPA] Querying OPA {opa} for: {address}")
@@ -243,18 +476,17 @@ async def geocode_address(session, cache_conn, address, opa=None):
         }
         url = f"{PHILA_AIS_URL}/{opa}"
 
-        async with session.get(url, params=params) as resp:
-            if resp.status == 200:
-                data = await resp.json()
-                if data.get("features") and len(data["features"]) > 0:
-                    coords = data["features"][0].get("geometry", {}).get("coordinates")
-                    if coords and len(coords) >= 2:
-                        lng = float(coords[0])
-                        lat = float(coords[1])
-                        cache_set(cache_conn, address, lat, lng)
-                        logger.debug(f"[OPA] Found OPA {opa} -> ({lat:.4f}, {lng:.4f})")
-                        await asyncio.sleep(0.5)  # Small delay for API politeness
-                        return (lat, lng)
+        status, data = await fetch_json(session, limits, url, params, "OPA")
+        opa_answered = status == 200
+        features = data.get("features") if status == 200 and data else None
+        coords = features[0].get("geometry", {}).get("coordinates") if features else None
+        if coords and len(coords) >= 2:
+            lng = float(coords[0])
+            lat = float(coords[1])
+            await cache_set(cache_conn, address, lat, lng)
+            logger.debug(f"[OPA] Found OPA {opa} -> ({lat:.4f}, {lng:.4f})")
+            await asyncio.sleep(0.5)  # Small delay for API politeness
+            return (lat, lng)
 
         logger.debug(f"[OPA] No results for OPA {opa}, trying Nominatim...")
 
@@ -266,31 +498,34 @@ async def geocode_address(session, cache_conn, address, opa=None):
         "limit": 1,
     }
 
-    async with session.get(NOMINATIM_URL, params=params) as resp:
-        if resp.status != 200:
-            logger.debug(f"[NOMINATIM] Failed ({resp.status}): {address}, trying zipcode fallback...")
-            return await geocode_zipcode_fallback(session, cache_conn, address, opa)
-
-        data = await resp.json()
-        if data:
-            lat = float(data[0]["lat"])
-            lng = float(data[0]["lon"])
-            cache_set(cache_conn, address, lat, lng)
-            logger.debug(f"[NOMINATIM] Found: {address} -> ({lat:.4f}, {lng:.4f})")
-            await asyncio.sleep(1)  # respect Nominatim rate limit
-            return (lat, lng)
+    status, data = await fetch_json(session, limits, NOMINATIM_URL, params, "NOMINATIM", throttle=True)
+    if status != 200:
+        logger.debug(f"[NOMINATIM] Failed ({status}): {address}, trying zipcode fallback...")
+        lat, lng, _ = await geocode_zipcode_fallback(session, limits, cache_conn, address, opa)
+        return (lat, lng)
+
+    if data:
+        lat = float(data[0]["lat"])
+        lng = float(data[0]["lon"])
+        await cache_set(cache_conn, address, lat, lng)
+        logger.debug(f"[NOMINATIM] Found: {address} -> ({lat:.4f}, {lng:.4f})")
+        return (lat, lng)
 
     logger.debug(f"[NOMINATIM] No results: {address}, trying zipcode fallback...")
-    return await geocode_zipcode_fallback(session, cache_conn, address, opa)
+    lat, lng, zip_answered = await geocode_zipcode_fallback(session, limits, cache_conn, address, opa)
+    if lat is None and opa_answered and zip_answered:
+        # Every lookup answered and nothing matched: remember the miss so reruns skip them all
+        await cache_set(cache_conn, address, None, None)
+    return (lat, lng)
 
 
-async def geocode_zipcode_fallback(session, cache_conn, address, opa=None):
-    """Fallback: extract zipcode and try geocoding that."""
+async def geocode_zipcode_fallback(session, limits, cache_conn, address, opa=None):
+    """Fallback: geocode the zipcode alone. Returns (lat, lng, answered); answered is False if the request failed."""
     # Extract zipcode (5 digits) from the address
-    zipcode_match = re.search(r'\b(\d{5})\b', str(address))
+    zipcode_match = ZIP_RE.search(str(address))
     if not zipcode_match:
         logger.debug(f"[ZIPCODE FALLBACK] No zipcode found in: {address}")
-        return (None, None)
+        return (None, None, True)
 
     zipcode = zipcode_match.group(1)
     logger.debug(f"[ZIPCODE FALLBACK] Extracted zipcode {zipcode} from: {address}")
@@ -301,58 +536,52 @@ async def geocode_zipcode_fallback(session, cache_conn, address, opa=None):
         "limit": 1,
     }
 
-    async with session.get(NOMINATIM_URL, params=params) as resp:
-        if resp.status != 200:
-            logger.debug(f"[ZIPCODE FALLBACK] Failed ({resp.status}): {zipcode}")
-            return (None, None)
-
-        data = await resp.json()
-        if data:
-            lat = float(data[0]["lat"])
-            lng = float(data[0]["lon"])
-            # Cache using zipcode
-            cache_set(cache_conn, zipcode, lat, lng)
-            logger.debug(f"[ZIPCODE FALLBACK] Found {zipcode} -> ({lat:.4f}, {lng:.4f})")
-            await asyncio.sleep(1)  # respect Nominatim rate limit
-            return (lat, lng)
+    status, data = await fetch_json(session, limits, NOMINATIM_URL, params, "ZIPCODE FALLBACK", throttle=True)
+    if status != 200:
+        logger.debug(f"[ZIPCODE FALLBACK] Failed ({status}): {zipcode}")
+        return (None, None, False)
+
+    if data:
+        lat = float(data[0]["lat"])
+        lng = float(data[0]["lon"])
+        # Cache using zipcode
+        await cache_set(cache_conn, zipcode, lat, lng)
+        logger.debug(f"[ZIPCODE FALLBACK] Found {zipcode} -> ({lat:.4f}, {lng:.4f})")
+        return (lat, lng, True)
 
     logger.debug(f"[ZIPCODE FALLBACK] No results for zipcode: {zipcode}")
-    return (None, None)
+    return (None, None, True)
 
 
-async def geocode_opa_fallback(session, cache_conn, address, opa=None):
-    """Fallback: use Philadelphia AIS API with OPA account number. Then try zipcode."""
-    if not opa:
-        logger.debug(f"[OPA FALLBACK] No OPA provided for: {address}, trying zipcode fallback...")
-        return await geocode_zipcode_fallback(session, cache_conn, address, opa)
+def normalize_address(address):
+    """Lowercase, turn punctuation into spaces and collapse whitespace: '100 N. 5th  St' -> '100 n 5th st'."""
+    return " ".join(ADDRESS_PUNCT_RE.sub(" ", str(address).lower()).split())
 
-    logger.debug(f"[OPA FALLBACK] Querying OPA {opa} for: {address}")
 
-    params = {
-        "gatekeeperKey": PHILA_GATEKEEPER_KEY,
+async def geocode_one(session, limits, cache_conn, neighborhood_tasks, address, opa=None):
+    """Returns (lat, lng, neighborhood) for one property; neighborhood_tasks shares reverse lookups."""
+    lat, lng = await geocode_address(session, limits, cache_conn, address, opa)
+    neighborhood = "Unknown"
+    if lat and lng:
+        key = neighborhood_key(lat, lng)
+        if key not in neighborhood_tasks:
+            neighborhood_tasks[key] = asyncio.ensure_future(
+                get_neighborhood(session, limits, cache_conn, lat, lng, address)
+            )
+        neighborhood = await neighborhood_tasks[key]
+    return lat, lng, neighborhood
+
+
+async def geocode_batch(session, limits, cache_conn, properties):
+    """Start geocoding {key: (address, opa)} and return {key: task resolving to (lat, lng, neighborhood)}."""
+    await cache_get_many(cache_conn, [addr for addr, _ in properties.values()])
+    # One reverse lookup per rounded coordinate, shared by every property that rounds to it
+    neighborhood_tasks = {}
+    return {
+        key: asyncio.ensure_future(geocode_one(session, limits, cache_conn, neighborhood_tasks, addr, opa))
+        for key, (addr, opa) in properties.items()
     }
 
-    url = f"{PHILA_AIS_URL}/{opa}"
-
-    async with session.get(url, params=params) as resp:
-        if resp.status != 200:
-            logger.debug(f"[OPA FALLBACK] Failed ({resp.status}): OPA {opa}, trying zipcode fallback...")
-            return await geocode_zipcode_fallback(session, cache_conn, address, opa)
-
-        data = await resp.json()
-        if data.get("features") and len(data["features"]) > 0:
-            coords = data["features"][0].get("geometry", {}).get("coordinates")
-            if coords and len(coords) >= 2:
-                lng = float(coords[0])
-                lat = float(coords[1])
-                cache_set(cache_conn, address, lat, lng)
-                logger.debug(f"[OPA FALLBACK] Found OPA {opa} -> ({lat:.4f}, {lng:.4f})")
-                await asyncio.sleep(0.5)  # Small delay for API politeness
-                return (lat, lng)
-
-    logger.debug(f"[OPA FALLBACK] No results for OPA: {opa}, trying zipcode fallback...")
-    return await geocode_zipcode_fallback(session, cache_conn, address, opa)
-
 
 # -------------------------------------------
 # HELPER FUNCTIONS
@@ -369,7 +598,7 @@ def format_currency(value):
 # -------------------------------------------
 def split_ampersand_field(value):
     """Split 'A & B & C' into ['A','B','C']."""
-    if not value:
+    if not value or value == "None":
         return []
     return [v.strip() for v in value.split("&")]
 
@@ -379,7 +608,6 @@ def split_ampersand_field(value):
 # -------------------------------------------
 def update_html_title(html_path, filename):
     """Update HTML page title based on filename. If filename is yyyymmdd format, convert to 'MMMM dd, yyyy'."""
-    import os
     from datetime import datetime
 
     # Extract filename without extension
@@ -414,14 +642,14 @@ def create_interactive_map(results, map_path, input_filename=None):
     logger.info("Creating interactive map...")
 
     # Filter valid results
-    valid_results = [r for r in results if r["lat"] is not None and r["lng"] is not None]
+    valid_results = [r for r in results if r.lat is not None and r.lng is not None]
     if not valid_results:
         logger.warning("No valid coordinates found for map generation")
         return
 
     # Calculate map center
-    center_lat = sum(r["lat"] for r in valid_results) / len(valid_results)
-    center_lng = sum(r["lng"] for r in valid_results) / len(valid_results)
+    coords = np.array([(r.lat, r.lng) for r in valid_results], dtype=float)
+    center_lat, center_lng = coords.mean(axis=0)
     logger.info(f"Map center: ({center_lat:.4f}, {center_lng:.4f})")
 
     # Create map with Philadelphia bounds
@@ -438,25 +666,30 @@ def create_interactive_map(results, map_path, input_filename=None):
         max_lon=-74.96
     )
 
-    # Group properties by neighborhood
-    neighborhoods = {}
-    for r in valid_results:
-        neighborhood = r.get("neighborhood", "Unknown")
-        if neighborhood not in neighborhoods:
-            neighborhoods[neighborhood] = []
-        neighborhoods[neighborhood].append(r)
+    # Group properties by neighborhood, as row indices into coords
+    by_neighborhood = defaultdict(list)
+    for i, r in enumerate(valid_results):
+        by_neighborhood[r.neighborhood].append(i)
 
-    # Create clusters for nearby properties
+    # Create clusters for nearby properties, reusing the coordinate array
     neighborhood_markers = {}
-    for neighborhood, props in neighborhoods.items():
-        clusters = cluster_properties(props, max_distance_feet=300)
+    for neighborhood, idx in by_neighborhood.items():
+        props = [valid_results[i] for i in idx]
         neighborhood_markers[neighborhood] = {
             "count": len(props),
-            "clusters": clusters,
+            "clusters": cluster_properties(props, max_distance_feet=300, coords=coords[idx]),
             "properties": props
         }
 
-    logger.info(f"Found {len(neighborhoods)} neighborhoods")
+    logger.info(f"Found {len(neighborhood_markers)} neighborhoods")
+
+    # Popup bodies for every single-property marker, built in one pass up front
+    popup_htmls = {
+        id(cluster[0]): _create_popup_html(cluster[0])
+        for data in neighborhood_markers.values()
+        for cluster in data["clusters"]
+        if len(cluster) == 1
+    }
 
     # Create feature groups for each neighborhood
     feature_groups = {}
@@ -467,6 +700,7 @@ def create_interactive_map(results, map_path, input_filename=None):
         fg = folium.FeatureGroup(name=neighborhood, show=True)
         feature_groups[neighborhood] = fg
         marker_ids[neighborhood] = {}
+        features = []
 
         # Add markers for each cluster
         for cluster_idx, cluster in enumerate(data["clusters"]):
@@ -479,71 +713,64 @@ def create_interactive_map(results, map_path, input_filename=None):
                 marker_id_counter += 1
                 if neighborhood not in marker_ids:
                     marker_ids[neighborhood] = {}
-                marker_ids[neighborhood][r['address']] = marker_id
+                marker_ids[neighborhood][r.address] = marker_id
 
                 # Create popup with hidden marker ID for reference
-                popup_html = f'<div data-marker-id="{marker_id}" style="display:none;">{marker_id}</div>{_create_popup_html(r)}'
-                popup = folium.Popup(popup_html, max_width=350)
-                marker_color, marker_icon = _get_marker_color_icon(r['status'])
-
-                # Create marker
-                marker = folium.Marker(
-                    location=[r['lat'], r['lng']],
-                    popup=popup,
-                    tooltip=f"{r['address']} - {r['status']}",
-                    icon=folium.Icon(color=marker_color, icon=marker_icon, prefix='fa')
-                )
-                marker.options['markerId'] = marker_id
-                marker.add_to(fg)
+                popup_html = f'<div data-marker-id="{marker_id}" style="display:none;">{marker_id}</div>{popup_htmls[id(r)]}'
+                marker_color, marker_icon = _get_marker_color_icon(r.status)
+
+                features.append(_marker_feature(
+                    marker_id, r.lat, r.lng, popup_html, 350,
+                    f"{r.address} - {r.status}", marker_color, marker_icon
+                ))
             else:
                 # Clustered properties - create a cluster marker
-                cluster_lat = sum(p["lat"] for p in cluster) / len(cluster)
-                cluster_lng = sum(p["lng"] for p in cluster) / len(cluster)
+                cluster_lat = sum(p.lat for p in cluster) / len(cluster)
+                cluster_lng = sum(p.lng for p in cluster) / len(cluster)
 
                 # Store marker ID for cluster
                 marker_id = f"marker_{marker_id_counter}"
                 marker_id_counter += 1
                 for prop in cluster:
-                    marker_ids[neighborhood][prop['address']] = marker_id
+                    marker_ids[neighborhood][prop.address] = marker_id
 
                 # Create HTML for cluster popup
-                cluster_html = f"""
+                cluster_parts = [f"""
                 <div style="display:none;" data-marker-id="{marker_id}">{marker_id}</div>
                 <div style="width: 400px; font-family: Arial, sans-serif; font-size: 12px;">
                     <h4 style="margin-top: 0; margin-bottom: 10px;">Properties Cluster ({len(cluster)} nearby)</h4>
                     <div style="max-height: 300px; overflow-y: auto;">
-                """
+                """]
 
                 for prop in cluster:
-                    cluster_html += f"""
+                    cluster_parts.append(f"""
                     <div style="margin-bottom: 8px; padding: 8px; background: #f9f9f9; border-left: 3px solid #007AFF;">
-                        <strong>{prop['address']}</strong><br>
-                        <small>Auction: {prop['auction_id']} | Status: {prop['status']}</small><br>
-                        <a href="{prop['bid4assets_link']}" target="_blank" style="color: #007AFF; text-decoration: none; font-size: 11px;">
+                        <strong>{prop.address}</strong><br>
+                        <small>Auction: {prop.auction_id} | Status: {prop.status}</small><br>
+                        <a href="{prop.bid4assets_link}" target="_blank" style="color: #007AFF; text-decoration: none; font-size: 11px;">
                             View Auction →
                         </a>
                     </div>
-                    """
+                    """)
 
-                cluster_html += """
+                cluster_parts.append("""
                     </div>
                 </div>
-                """
-
-                popup = folium.Popup(cluster_html, max_width=450)
+                """)
 
                 # Use a different icon for clusters
-                marker = folium.Marker(
-                    location=[cluster_lat, cluster_lng],
-                    popup=popup,
-                    tooltip=f"Cluster: {len(cluster)} properties within 300 feet",
-                    icon=folium.Icon(color='red', icon='sitemap', prefix='fa')
-                )
-
-                # Add marker ID to options for JavaScript reference
-                marker.options['markerId'] = marker_id
-                marker.add_to(fg)
-
+                features.append(_marker_feature(
+                    marker_id, cluster_lat, cluster_lng, "".join(cluster_parts), 450,
+                    f"Cluster: {len(cluster)} properties within 300 feet", 'red', 'sitemap'
+                ))
+
+        # All of the neighborhood's markers go out as one GeoJSON layer
+        folium.GeoJson(
+            {"type": "FeatureCollection", "features": features},
+            marker=folium.Marker(icon=folium.Icon(prefix='fa')),
+            style_function=_marker_style,
+            on_each_feature=_BIND_MARKER_JS,
+        ).add_to(fg)
         fg.add_to(map_obj)
 
     # Create custom legend with neighborhood counts
@@ -551,18 +778,8 @@ def create_interactive_map(results, map_path, input_filename=None):
     from folium import Element
     map_obj.get_root().html.add_child(Element(legend_html))
 
-    # Create a script that will be injected to register all markers
-    marker_registration = """
-    <script>
-    window.markerDatabase = {};
-
-    function registerMarker(markerId, marker) {
-        window.markerDatabase[markerId] = marker;
-        console.log('Registered marker:', markerId);
-    }
-    </script>
-    """
-    map_obj.get_root().html.add_child(Element(marker_registration))
+    # Inject the script that registers all markers
+    map_obj.get_root().html.add_child(Element(_MARKER_REGISTRATION_JS))
 
 
     # Add layer control
@@ -578,32 +795,82 @@ def create_interactive_map(results, map_path, input_filename=None):
         update_html_title(map_path, input_filename)
 
 
+def _compact_static_html(html):
+    """Drop indentation, blank lines and whole-line // comments from a static HTML/CSS/JS block."""
+    lines = (line.strip() for line in html.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+# Registry the legend script can look markers up in
+_MARKER_REGISTRATION_JS = _compact_static_html("""
+    <script>
+    window.markerDatabase = {};
+
+    function registerMarker(markerId, marker) {
+        window.markerDatabase[markerId] = marker;
+        console.log('Registered marker:', markerId);
+    }
+    </script>
+""")
+
+# Binds each GeoJSON marker's popup and tooltip, and tags it with its markerId for the legend
+_BIND_MARKER_JS = folium.JsCode("""
+    function(feature, layer) {
+        var props = feature.properties;
+        layer.options.markerId = feature.id;
+        layer.bindPopup(props.popup_html, {maxWidth: props.popup_width});
+        layer.bindTooltip(props.tooltip, {sticky: true});
+    }
+""")
+
+
+def _marker_feature(marker_id, lat, lng, popup_html, popup_width, tooltip, color, icon):
+    """GeoJSON point feature carrying everything _BIND_MARKER_JS and _marker_style need."""
+    return {
+        "type": "Feature",
+        "id": marker_id,
+        "geometry": {"type": "Point", "coordinates": [lng, lat]},
+        "properties": {
+            "popup_html": popup_html,
+            "popup_width": popup_width,
+            "tooltip": tooltip,
+            "color": color,
+            "icon": icon,
+        },
+    }
+
+
+def _marker_style(feature):
+    """Per-feature AwesomeMarkers icon options for the GeoJSON marker layer."""
+    return {"markerColor": feature["properties"]["color"], "icon": feature["properties"]["icon"]}
+
+
 def _create_popup_html(r):
     """Create popup HTML for a single property."""
-    open_date_str = str(r["open_date"]) if r["open_date"] else "N/A"
-    min_bid_str = format_currency(r['min_bid'])
-    debt_amount_str = format_currency(r['debt_amount'])
+    open_date_str = str(r.open_date) if r.open_date else "N/A"
+    min_bid_str = format_currency(r.min_bid)
+    debt_amount_str = format_currency(r.debt_amount)
 
     # Create linked Auction ID
-    auction_id = r['auction_id']
-    if r['bid4assets_link']:
-        auction_id_display = f"<a href='{r['bid4assets_link']}' target='_blank'>{auction_id}</a>"
+    auction_id = r.auction_id
+    if r.bid4assets_link:
+        auction_id_display = f"<a href='{r.bid4assets_link}' target='_blank'>{auction_id}</a>"
     else:
         auction_id_display = str(auction_id)
 
     # Create linked OPA ID
-    opa_display = r['opa'] or 'N/A'
-    if r['opa'] and r['phila_link']:
-        opa_display = f"<a href='{r['phila_link']}' target='_blank'>{r['opa']}</a>"
+    opa_display = r.opa or 'N/A'
+    if r.opa and r.phila_link:
+        opa_display = f"<a href='{r.phila_link}' target='_blank'>{r.opa}</a>"
 
     popup_html = f"""
     <div style="width: 320px; font-family: Arial, sans-serif; font-size: 12px;">
-        <h4 style="margin-top: 0; margin-bottom: 10px;">{r['address']}</h4>
+        <h4 style="margin-top: 0; margin-bottom: 10px;">{r.address}</h4>
 
         <div style="margin-bottom: 10px;">
             <strong>Auction ID:</strong> {auction_id_display}<br>
-            <strong>Neighborhood:</strong> {r.get('neighborhood', 'Unknown')}<br>
-            <strong>Status:</strong> {r['status']}<br>
+            <strong>Neighborhood:</strong> {r.neighborhood}<br>
+            <strong>Status:</strong> {r.status}<br>
             <strong>Start Price:</strong> {min_bid_str}<br>
             <strong>Auction Opens:</strong> {open_date_str}
         </div>
@@ -611,7 +878,7 @@ def _create_popup_html(r):
         <div style="margin-bottom: 10px;">
             <strong>Property Info:</strong><br>
             OPA: {opa_display}<br>
-            Book/Writ: {r['book_writ'] or 'N/A'}<br>
+            Book/Writ: {r.book_writ or 'N/A'}<br>
             Debt Amount: {debt_amount_str}
         </div>
 
@@ -619,8 +886,8 @@ def _create_popup_html(r):
             <strong>Links:</strong><br>
     """
 
-    if r['streetview']:
-        popup_html += f"<a href='{r['streetview']}' target='_blank'>🚗 Google Street View</a><br>"
+    if r.streetview:
+        popup_html += f"<a href='{r.streetview}' target='_blank'>🚗 Google Street View</a><br>"
 
     popup_html += """
         </div>
@@ -642,9 +909,9 @@ def _get_marker_color_icon(status):
         return 'blue', 'gavel'
 
 
-def _create_legend_html(neighborhood_markers, marker_ids):
-    """Create interactive HTML legend for neighborhoods."""
-    legend_html = """
+# Static parts of the legend: container/title, and the status key with its CSS and JS.
+# Compacted once at import; only the per-neighborhood entries are formatted per map.
+_LEGEND_HEADER_HTML = _compact_static_html("""
     <div id="legend" style="
         position: fixed;
         bottom: 50px; left: 50px;
@@ -663,55 +930,9 @@ def _create_legend_html(neighborhood_markers, marker_ids):
         <h3 style="margin-top: 0; margin-bottom: 12px; font-size: 16px;">
             Properties by Neighborhood
         </h3>
-    """
-
-    # Sort neighborhoods by count (descending)
-    sorted_neighborhoods = sorted(
-        neighborhood_markers.items(),
-        key=lambda x: x[1]['count'],
-        reverse=True
-    )
-
-    for neighborhood, data in sorted_neighborhoods:
-        count = data['count']
-        properties = data['properties']
-
-        # Create addresses list HTML (hidden by default)
-        addresses_html = '<div style="display:none;" class="addresses-list">'
-        for prop in sorted(properties, key=lambda x: x['address']):
-            marker_id = marker_ids.get(neighborhood, {}).get(prop['address'], '')
-            addresses_html += f"""
-            <div class="address-item" data-marker-id="{marker_id}" style="padding: 6px 8px; margin: 4px 0; background: #f0f0f0; border-radius: 3px; font-size: 12px; cursor: pointer; transition: all 0.2s;" onmouseover="highlightMarker('{marker_id}'); this.style.backgroundColor='#ddd';" onmouseout="unhighlightMarker('{marker_id}'); this.style.backgroundColor='#f0f0f0';" onclick="event.stopPropagation(); panToMarker('{marker_id}');">
-                {prop['address']}
-            </div>
-            """
-        addresses_html += '</div>'
-
-        legend_html += f"""
-        <div style="
-            margin-bottom: 8px;
-            padding: 10px;
-            background-color: #f9f9f9;
-            border-left: 4px solid #0066cc;
-            cursor: pointer;
-            border-radius: 3px;
-            transition: background-color 0.2s;
-        " class="neighborhood-item" onmouseover="this.style.backgroundColor='#e6f2ff'" onmouseout="this.style.backgroundColor='#f9f9f9'" onclick="this.querySelector('.addresses-list').style.display = this.querySelector('.addresses-list').style.display === 'none' ? 'block' : 'none'">
-            <strong style="font-size: 13px;">{neighborhood}</strong>
-            <span style="
-                display: inline-block;
-                background-color: #0066cc;
-                color: white;
-                border-radius: 12px;
-                padding: 2px 8px;
-                font-size: 12px;
-                margin-left: 8px;
-            ">{count}</span>
-            {addresses_html}
-        </div>
-        """
+    """)
 
-    legend_html += """
+_LEGEND_FOOTER_HTML = _compact_static_html("""
         <div style="margin-top: 12px; padding-top: 12px; border-top: 1px solid #ddd; font-size: 11px; color: #666;">
             <strong>Legend:</strong><br>
             <span style="color: blue;">●</span> Blue = Active<br>
@@ -873,9 +1094,238 @@ def _create_legend_html(neighborhood_markers, marker_ids):
         }
     });
     </script>
-    """
+    """)
 
-    return legend_html
+
+def _create_legend_html(neighborhood_markers, marker_ids):
+    """Create interactive HTML legend for neighborhoods."""
+    parts = [_LEGEND_HEADER_HTML]
+
+    # Sort neighborhoods by count (descending)
+    sorted_neighborhoods = sorted(
+        neighborhood_markers.items(),
+        key=lambda x: x[1]['count'],
+        reverse=True
+    )
+
+    for neighborhood, data in sorted_neighborhoods:
+        count = data['count']
+        properties = data['properties']
+
+        # Create addresses list HTML (hidden by default)
+        address_parts = ['<div style="display:none;" class="addresses-list">']
+        for prop in sorted(properties, key=lambda x: x.address):
+            marker_id = marker_ids.get(neighborhood, {}).get(prop.address, '')
+            address_parts.append(f"""
+            <div class="address-item" data-marker-id="{marker_id}" style="padding: 6px 8px; margin: 4px 0; background: #f0f0f0; border-radius: 3px; font-size: 12px; cursor: pointer; transition: all 0.2s;" onmouseover="highlightMarker('{marker_id}'); this.style.backgroundColor='#ddd';" onmouseout="unhighlightMarker('{marker_id}'); this.style.backgroundColor='#f0f0f0';" onclick="event.stopPropagation(); panToMarker('{marker_id}');">
+                {prop.address}
+            </div>
+            """)
+        address_parts.append('</div>')
+        addresses_html = "".join(address_parts)
+
+        parts.append(f"""
+        <div style="
+            margin-bottom: 8px;
+            padding: 10px;
+            background-color: #f9f9f9;
+            border-left: 4px solid #0066cc;
+            cursor: pointer;
+            border-radius: 3px;
+            transition: background-color 0.2s;
+        " class="neighborhood-item" onmouseover="this.style.backgroundColor='#e6f2ff'" onmouseout="this.style.backgroundColor='#f9f9f9'" onclick="this.querySelector('.addresses-list').style.display = this.querySelector('.addresses-list').style.display === 'none' ? 'block' : 'none'">
+            <strong style="font-size: 13px;">{neighborhood}</strong>
+            <span style="
+                display: inline-block;
+                background-color: #0066cc;
+                color: white;
+                border-radius: 12px;
+                padding: 2px 8px;
+                font-size: 12px;
+                margin-left: 8px;
+            ">{count}</span>
+            {addresses_html}
+        </div>
+        """)
+
+    parts.append(_LEGEND_FOOTER_HTML)
+    return "".join(parts)
+
+
+# -------------------------------------------
+# EXCEL OUTPUT
+# -------------------------------------------
+# The output is a fixed, unstyled single sheet, so the package parts other than the
+# sheet itself never change and the sheet XML is written directly.
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Sheet" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+_XLSX_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+_XLSX_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_XLSX_SHEET_TAIL = '</sheetData></worksheet>'
+
+# Control characters XML 1.0 cannot carry at all
+_XML_ILLEGAL_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _xlsx_cell(ref, value):
+    """One <c> element; None (and NaN/inf, as openpyxl does) is an empty cell and is left out."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        # Same 16 significant digits openpyxl writes numbers with
+        return f'<c r="{ref}"><v>{value:.16g}</v></c>' if isfinite(value) else ""
+    text = xml_escape(_XML_ILLEGAL_RE.sub("", str(value)))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+# One AuctionRow -> its OUTPUT_COLUMNS values as a tuple, in a single C call
+_output_row = attrgetter(*(key for _, key in OUTPUT_COLUMNS))
+
+
+_XLSX_COLUMN_LETTERS = [openpyxl.utils.get_column_letter(i) for i in range(1, len(OUTPUT_COLUMNS) + 1)]
+
+
+class ExcelWriter:
+    """Streams AuctionRows into a single-sheet workbook with the OUTPUT_COLUMNS layout."""
+
+    def __init__(self, output_path):
+        # Built next to the destination and moved over it by close()
+        self._path = output_path
+        self._tmp_path = f"{output_path}.tmp"
+        self._zip = zipfile.ZipFile(self._tmp_path, "w", zipfile.ZIP_DEFLATED,
+                                    compresslevel=XLSX_COMPRESS_LEVEL)
+        self._zip.writestr("[Content_Types].xml", _XLSX_CONTENT_TYPES)
+        self._zip.writestr("_rels/.rels", _XLSX_ROOT_RELS)
+        self._zip.writestr("xl/workbook.xml", _XLSX_WORKBOOK)
+        self._zip.writestr("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS)
+        self._zip.writestr("xl/styles.xml", _XLSX_STYLES)
+
+        self._sheet = self._zip.open("xl/worksheets/sheet1.xml", "w")
+        self._sheet.write(_XLSX_SHEET_HEAD.encode())
+        # Rows are converted into a text buffer and handed to the compressor in blocks
+        self._buffer = []
+        self._row_num = 0
+        self._append([header for header, _ in OUTPUT_COLUMNS])
+
+    def _append(self, values):
+        self._row_num += 1
+        row_num = self._row_num
+        cells = "".join(_xlsx_cell(f"{letter}{row_num}", v) for letter, v in zip(_XLSX_COLUMN_LETTERS, values))
+        self._buffer.append(f'<row r="{row_num}">{cells}</row>')
+        if len(self._buffer) == XLSX_ROWS_PER_WRITE:
+            self._sheet.write("".join(self._buffer).encode())
+            self._buffer.clear()
+
+    def write(self, row):
+        self._append(_output_row(row))
+
+    def close(self):
+        self._buffer.append(_XLSX_SHEET_TAIL)
+        self._sheet.write("".join(self._buffer).encode())
+        self._sheet.close()
+        self._zip.close()
+        os.replace(self._tmp_path, self._path)
+
+    def discard(self):
+        """Delete the partial workbook, leaving any previous output in place."""
+        self._sheet.close()
+        self._zip.close()
+        os.remove(self._tmp_path)
+
+
+# -------------------------------------------
+# GEOJSON OUTPUT
+# -------------------------------------------
+# Every feature is a Point; only its coordinates and properties are encoded per row
+_GEOJSON_FEATURE = b'{"type":"Feature","geometry":{"type":"Point","coordinates":%b},"properties":%b}'
+# Feature properties: every AuctionRow field except the coordinates the geometry already carries
+_GEOJSON_FIELDS = tuple(f.name for f in fields(AuctionRow) if f.name not in ("lat", "lng"))
+_geojson_values = attrgetter(*_GEOJSON_FIELDS)
+
+
+class GeoJSONWriter:
+    """Streams located AuctionRows into a FeatureCollection file; count is the features written."""
+
+    def __init__(self, geojson_path):
+        # Built next to the destination and moved over it by close()
+        self._path = geojson_path
+        self._tmp_path = f"{geojson_path}.tmp"
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(b'{"type":"FeatureCollection","features":[')
+        self.count = 0
+
+    def write(self, row):
+        """Add row as a feature; rows without coordinates are skipped."""
+        if not row.lat:
+            return
+        if self.count:
+            self._file.write(b",")
+        properties = {k: v for k, v in zip(_GEOJSON_FIELDS, _geojson_values(row)) if v is not None}
+        self._file.write(_GEOJSON_FEATURE % (orjson.dumps((row.lng, row.lat)), orjson.dumps(properties)))
+        self.count += 1
+
+    def close(self):
+        self._file.write(b"]}")
+        self._file.close()
+        os.replace(self._tmp_path, self._path)
+
+    def discard(self):
+        """Delete the partial file, leaving any previous output in place."""
+        self._file.close()
+        os.remove(self._tmp_path)
 
 
 # -------------------------------------------
@@ -883,17 +1333,18 @@ def _create_legend_html(neighborhood_markers, marker_ids):
 # -------------------------------------------
 async def process_file(input_path, output_path, geojson_path, map_path):
     logger.info(f"Starting processing: {input_path}")
-    cache_conn = init_cache()
-    logger.info("Geocode cache initialized")
-    init_neighborhood_cache()
-    logger.info("Neighborhood cache initialized")
 
-    wb = openpyxl.load_workbook(input_path)
+    # Streamed: rows come back as plain value tuples, no Cell objects or styles
+    wb = openpyxl.load_workbook(input_path, read_only=True, data_only=True)
     sheet = wb.active
     logger.info(f"Loaded Excel file with {sheet.max_row} rows")
+    # The size recorded in the file can be missing or too small; read every cell
+    # actually present instead, and pad short rows below
+    sheet.reset_dimensions()
 
     # Row 3 = headers
-    headers = [cell.value for cell in sheet[3]]
+    headers = list(next(sheet.iter_rows(min_row=3, max_row=3, values_only=True)))
+    width = len(headers)
     logger.info(f"Found headers: {headers}")
 
     # Required fields
@@ -914,27 +1365,38 @@ async def process_file(input_path, output_path, geojson_path, map_path):
         idx_debt = None
         logger.warning("'Debt Amount' header not found, defaulting all debts to $0")
 
-    tasks = []
+    rows = []
     results = []
-    logger.info(f"Starting geocoding with {CONCURRENT_WORKERS} concurrent workers...")
-
-    async with aiohttp.ClientSession(headers={"User-Agent": USER_AGENT}) as session:
-        sem = asyncio.Semaphore(CONCURRENT_WORKERS)
-
-        for row_num, row in enumerate(sheet.iter_rows(min_row=4), start=4):
-            auction_id = str(row[idx_auction_id].value).strip()
-            status = row[idx_status].value
-            min_bid = row[idx_min_bid].value
-            open_date = row[idx_open].value
-            attorney = row[idx_attorney].value
-            debt_amount = row[idx_debt].value if idx_debt is not None else 0
-            book = row[idx_book].value
-            opa_raw = row[idx_opa].value
-            addr_raw = row[idx_address].value
+    logger.info(f"Starting geocoding with up to {CONCURRENT_WORKERS} concurrent requests...")
+
+    # Keep-alive pool sized to the request slots, with DNS answers reused for the whole run
+    connector = aiohttp.TCPConnector(limit=CONCURRENT_WORKERS, ttl_dns_cache=DNS_CACHE_TTL)
+    async with aiohttp.ClientSession(headers={"User-Agent": USER_AGENT}, connector=connector) as session:
+        limits = RequestLimits()
+        # normalized address -> the (address, OPA) to geocode it with, one lookup per entry
+        unique = {}
+
+        for row_num, row in enumerate(sheet.iter_rows(min_row=4, values_only=True), start=4):
+            if len(row) < width:
+                # Trailing empty cells aren't stored, so the row stops at its last value
+                row += (None,) * (width - len(row))
+            auction_id = str(row[idx_auction_id]).strip()
+            status = row[idx_status]
+            min_bid = row[idx_min_bid]
+            open_date = row[idx_open]
+            attorney = row[idx_attorney]
+            debt_amount = row[idx_debt] if idx_debt is not None else 0
+            book = row[idx_book]
+            opa_raw = row[idx_opa]
+            addr_raw = row[idx_address]
+
+            # Per sheet row, shared by every property an ampersand row splits into
+            bid4assets_link = BID4ASSETS_LINK_PREFIX + auction_id
+            open_date = str(open_date) if open_date else None
 
             addresses = split_ampersand_field(addr_raw)
-            opas = split_ampersand_field(str(opa_raw))
-            books = split_ampersand_field(str(book))
+            opas = split_ampersand_field(str(opa_raw)) if opa_raw not in (None, "") else []
+            books = split_ampersand_field(str(book)) if book not in (None, "") else []
 
             # normalize lengths
             max_len = max(len(addresses), len(opas), len(books))
@@ -950,94 +1412,85 @@ async def process_file(input_path, output_path, geojson_path, map_path):
                 if not addr:
                     continue
 
-                async def worker(addr=addr, opa=opa, bk=bk, auction_id=auction_id, status=status,
-                               min_bid=min_bid, open_date=open_date, attorney=attorney, debt_amount=debt_amount):
-                    async with sem:
-                        lat, lng = await geocode_address(session, cache_conn, addr, opa)
-                        neighborhood = "Unknown"
-                        if lat and lng:
-                            neighborhood = await get_neighborhood(session, cache_conn, lat, lng, addr)
-                        return {
-                            "auction_id": auction_id,
-                            "status": status,
-                            "min_bid": min_bid,
-                            "open_date": str(open_date) if open_date else None,
-                            "attorney": attorney,
-                            "debt_amount": debt_amount,
-                            "book_writ": bk,
-                            "opa": opa,
-                            "address": addr,
-                            "lat": lat,
-                            "lng": lng,
-                            "neighborhood": neighborhood,
-                            "phila_link": f"https://property.phila.gov/?p={opa}" if opa else None,
-                            "bid4assets_link": f"https://www.bid4assets.com/auction/index/{auction_id}",
-                            "streetview": f"https://www.google.com/maps/place/{quote_plus(addr)}/" if addr else None,
-                        }
-
-                tasks.append(worker())
-
-        logger.info(f"Created {len(tasks)} geocoding tasks, waiting for completion...")
-        results = await asyncio.gather(*tasks)
-        logger.info(f"Geocoding complete. Processing {len(results)} results...")
+                key = normalize_address(addr)
+                # Prefer a listing that has an OPA: the AIS lookup is the most precise
+                if key not in unique or (opa and not unique[key][1]):
+                    unique[key] = (addr, opa)
+                rows.append((auction_id, status, min_bid, open_date, attorney, debt_amount, bk, opa, addr, key,
+                             bid4assets_link))
+
+        wb.close()
+        logger.info(f"Geocoding {len(unique)} unique addresses for {len(rows)} properties...")
+
+        # -------------------------------------------
+        # WRITE EXCEL + GEOJSON AS ROWS RESOLVE
+        # -------------------------------------------
+        # Rows are written in sheet order as soon as their own lookup is done, while
+        # later lookups are still in flight
+        logger.info(f"Writing Excel file: {output_path}")
+        logger.info(f"Writing GeoJSON file: {geojson_path}")
+        # Opened only now, so that every path that opens it goes through the finally below
+        cache_conn = await init_cache()
+        logger.info("Geocode and neighborhood cache initialized")
+        located = {}
+        excel = geojson = None
+        try:
+            located = await geocode_batch(session, limits, cache_conn, unique)
+            excel = ExcelWriter(output_path)
+            geojson = GeoJSONWriter(geojson_path)
+            streetviews = {}  # address -> Street View link, so each address is URL-quoted once
+            for (auction_id, status, min_bid, open_date, attorney, debt_amount, bk, opa, addr, key,
+                 bid4assets_link) in rows:
+                lat, lng, neighborhood = await located[key]
+                streetview = streetviews.get(addr)
+                if streetview is None:
+                    streetview = streetviews[addr] = STREETVIEW_LINK_PREFIX + quote_plus(addr) + "/"
+                row = AuctionRow(
+                    auction_id=auction_id,
+                    status=status,
+                    min_bid=min_bid,
+                    open_date=open_date,
+                    attorney=attorney,
+                    debt_amount=debt_amount,
+                    book_writ=bk,
+                    opa=opa,
+                    address=addr,
+                    lat=lat,
+                    lng=lng,
+                    neighborhood=neighborhood,
+                    phila_link=PHILA_LINK_PREFIX + opa if opa else None,
+                    bid4assets_link=bid4assets_link,
+                    streetview=streetview,
+                )
+                results.append(row)
+                excel.write(row)
+                geojson.write(row)
+        except BaseException:
+            # Keep the last good outputs rather than replacing them with partial files
+            for writer in (excel, geojson):
+                if writer is not None:
+                    writer.discard()
+            raise
+        finally:
+            # Nothing may still be using the cache connection once it closes
+            for task in located.values():
+                task.cancel()
+            # Flush whatever the batched cache writes haven't committed yet
+            await cache_conn.commit()
+            await cache_conn.close()
+        logger.info(f"Geocoding complete. Processed {len(results)} results")
 
     # -------------------------------------------
-    # WRITE NEW EXCEL
+    # FINISH EXCEL + GEOJSON, CREATE INTERACTIVE MAP
     # -------------------------------------------
-    logger.info(f"Writing Excel file: {output_path}")
-    new_wb = Workbook()
-    new_sheet = new_wb.active
-    new_sheet.append([
-        "Auction ID", "Status", "Minimum Bid", "Open Date",
-        "Attorney", "Debt Amount", "Book/Writ", "OPA", "Address",
-        "Neighborhood", "Lat", "Lng", "Phila Link", "Bid4Assets Link", "Google Street View"
-    ])
-
-    for r in results:
-        new_sheet.append([
-            r["auction_id"],
-            r["status"],
-            r["min_bid"],
-            r["open_date"],
-            r["attorney"],
-            r["debt_amount"],
-            r["book_writ"],
-            r["opa"],
-            r["address"],
-            r["neighborhood"],
-            r["lat"],
-            r["lng"],
-            r["phila_link"],
-            r["bid4assets_link"],
-            r["streetview"]
-        ])
-
-    new_wb.save(output_path)
+    # Independent of each other, so they run side by side off the event loop
+    await asyncio.gather(
+        asyncio.to_thread(excel.close),
+        asyncio.to_thread(geojson.close),
+        asyncio.to_thread(create_interactive_map, results, map_path, input_path),
+    )
     logger.info(f"Excel file saved successfully")
-
-    # -------------------------------------------
-    # WRITE GEOJSON
-    # -------------------------------------------
-    logger.info(f"Writing GeoJSON file: {geojson_path}")
-    with open(geojson_path, "w") as f:
-        features = []
-        for r in results:
-            if not r["lat"]:
-                continue
-            feat = {
-                "type": "Feature",
-                "geometry": {"type": "Point", "coordinates": [r["lng"], r["lat"]]},
-                "properties": r,
-            }
-            features.append(feat)
-
-        f.write(json.dumps({"type": "FeatureCollection", "features": features}, indent=2))
-    logger.info(f"GeoJSON written with {len(features)} features")
-
-    # -------------------------------------------
-    # CREATE INTERACTIVE MAP
-    # -------------------------------------------
-    create_interactive_map(results, map_path, input_path)
+    logger.info(f"GeoJSON written with {geojson.count} features")
 
     logger.info(f"✔ Processing complete!")
     logger.info(f"  - Excel output: {output_path}")
@@ -1050,7 +1503,6 @@ async def process_file(input_path, output_path, geojson_path, map_path):
 # -------------------------------------------
 if __name__ == "__main__":
     import sys
-    import os
 
     if len(sys.argv) < 2:
         logger.error("Usage: python process_auctions.py /path/to/AuctionList.xlsx")